@@ -10,13 +10,14 @@ This allows the web app to start training without needing Docker access.
 """
 import os
 import uuid
+import asyncio
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
-from fastapi import FastAPI, HTTPException
+from typing import Optional, Dict, Any, List
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from preprocess_data import init_database, ingest_raw_landmarks, ingest_normalized_landmarks
+from preprocess_data import init_database, ingest_raw_landmarks_from_zip, ingest_normalized_landmarks
 
 DB_PATH = Path(os.getenv("LANDMARKS_DB_PATH"))
 RAW_IMAGES_PATH = Path(os.getenv("RAW_IMAGES_PATH"))
@@ -28,6 +29,12 @@ app = FastAPI(title="ML Training API", version="1.0.0")
 training_jobs: Dict[str, Dict[str, Any]] = {}
 
 preprocessing_jobs: Dict[str, Dict[str, Any]] = {}
+# Set once a preprocessing job reaches a terminal state, wakes up long-polling status requests.
+# Removed at the same time: later requests see the terminal status and never wait.
+preprocessing_done: Dict[str, asyncio.Event] = {}
+
+# Upper bound for the ?wait= long-poll on status endpoints (seconds)
+MAX_STATUS_WAIT = 30
 
 
 # Pydantic models for request/response validation
@@ -165,14 +172,31 @@ async def start_training(config: TrainingConfig):
     )
 
 
+def _training_job_etag(job: Dict[str, Any]) -> str:
+    # a job only changes when its status or timestamps change (output is stored once, at the end)
+    return f'"{job.get("status")}-{job.get("started_at") or ""}-{job.get("completed_at") or ""}"'
+
+
 @app.get('/train/{job_id}')
-async def get_training_status(job_id: str):
-    """Get status of a training job."""
+async def get_training_status(job_id: str, request: Request, response: Response, include_logs: bool = False):
+    """
+    Get status of a training job. Answers 304 if the If-None-Match ETag is still current.
+
+    With ?include_logs=1 the stdout/stderr fields are always present, so pollers do not
+    need a separate /logs request.
+    """
     job = training_jobs.get(job_id)
 
     if not job:
         raise HTTPException(status_code=404, detail='Job not found')
 
+    etag = _training_job_etag(job)
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
+    if include_logs:
+        return {**job, 'stdout': job.get('stdout', ''), 'stderr': job.get('stderr', '')}
     return job
 
 
@@ -191,12 +215,24 @@ async def get_training_logs(job_id: str):
     }
 
 @app.get('/train')
-async def list_training_jobs():
-    """List all training jobs."""
+async def list_training_jobs(job_id: Optional[List[str]] = Query(None)):
+    """
+    List all training jobs.
+
+    With ?job_id=...&job_id=... only those jobs are returned (unknown ids are left out),
+    so a poller can refresh several runs in one request.
+    """
+    if job_id is None:
+        return {'jobs': list(training_jobs.values())}
     return {
-        'jobs': list(training_jobs.values())
+        'jobs': [training_jobs[j] for j in job_id if j in training_jobs]
     }
 
+def _finish_preprocessing(job_id: str, done: asyncio.Event):
+    # runs on the event loop; requests already waiting hold their own reference to the event
+    preprocessing_done.pop(job_id, None)
+    done.set()
+
 @app.post("/preprocess", response_model=TrainingJobResponse)
 async def run_preprocessing(request: PreprocJobRequest):
     job_id = f"preprocess_{uuid.uuid4().hex[:8]}"
@@ -205,11 +241,11 @@ async def run_preprocessing(request: PreprocJobRequest):
         "status": "pending",
         "message": "",
     }
+    # the worker thread sets the event through the loop, asyncio.Event is not thread-safe
+    loop = asyncio.get_running_loop()
+    done = preprocessing_done[job_id] = asyncio.Event()
 
     def task():
-        import shutil
-        import zipfile
-
         try:
             preprocessing_jobs[job_id]["status"] = "running"
 
@@ -220,24 +256,11 @@ async def run_preprocessing(request: PreprocJobRequest):
             if not zip_path.exists():
                 raise FileNotFoundError(f"ZIP file not found: {zip_path}")
 
-            # Temp extraction path (local to container, fast I/O)
-            temp_extract_path = Path("/tmp") / f"extract_{job_id}"
-            temp_extract_path.mkdir(parents=True, exist_ok=True)
-
             try:
-                print(f"Extracting {zip_path} to {temp_extract_path}")
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_extract_path)
-
-                # Verify structure (handle optional root folder)
-                # If everything is in one subfolder, perform processing on that subfolder
-                content = list(temp_extract_path.iterdir())
-                target_root = temp_extract_path
-                if len(content) == 1 and content[0].is_dir():
-                    target_root = content[0]
-
+                # Images are decoded straight from the archive (handles an optional root folder),
+                # so nothing is extracted to disk
                 init_database(DB_PATH)
-                raw_stats = ingest_raw_landmarks(DB_PATH, LANDMARK_DETECTOR_PATH, target_root, request.dataset_version)
+                raw_stats = ingest_raw_landmarks_from_zip(DB_PATH, LANDMARK_DETECTOR_PATH, zip_path, request.dataset_version)
                 normalized_stats = ingest_normalized_landmarks(DB_PATH, request.dataset_version)
 
                 preprocessing_jobs[job_id]["status"] = "completed"
@@ -249,10 +272,6 @@ async def run_preprocessing(request: PreprocJobRequest):
                 }
 
             finally:
-                # Cleanup temp files
-                if temp_extract_path.exists():
-                    shutil.rmtree(temp_extract_path)
-
                 # Cleanup source ZIP (landmarks are now in DB, raw images no longer needed)
                 if zip_path.exists():
                     try:
@@ -265,16 +284,32 @@ async def run_preprocessing(request: PreprocJobRequest):
             print(f"Preprocessing error: {e}")
             preprocessing_jobs[job_id]["status"] = "failed"
             preprocessing_jobs[job_id]["message"] = str(e)
+        finally:
+            loop.call_soon_threadsafe(_finish_preprocessing, job_id, done)
 
     threading.Thread(target=task, daemon=True).start()
 
     return TrainingJobResponse(job_id=job_id, status="pending", message="Preprocessing started")
 
 @app.get("/preprocess/{job_id}")
-async def get_preprocessing_status(job_id: str):
+async def get_preprocessing_status(job_id: str, wait: float = 0):
+    """
+    Get status of a preprocessing job.
+
+    With ?wait=N the request is held (up to MAX_STATUS_WAIT seconds) until the job
+    completes or fails, so clients learn about completion without polling.
+    """
     job = preprocessing_jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Preprocessing job not found")
+
+    if wait > 0 and job["status"] in ("pending", "running"):
+        # waiting on the loop does not tie up a threadpool worker per held request
+        try:
+            await asyncio.wait_for(preprocessing_done[job_id].wait(), min(wait, MAX_STATUS_WAIT))
+        except asyncio.TimeoutError:
+            pass
+
     return job
 
 
@@ -6,119 +6,201 @@
 from typing import Dict
 import cv2
 import json
+import os
 import sqlite3
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import mediapipe as mp
-from collections import defaultdict
+from collections import deque
 
 # exposed functions
 __all__ = [
     "init_database",
-    "ingest_raw_landmarks",
+    "ingest_raw_landmarks_from_zip",
     "ingest_normalized_landmarks",
 ]
 
+# images decoded in parallel while the (single, not thread-safe) landmarker works through them
+DECODE_WORKERS = min(8, os.cpu_count() or 1)
+# decodes kept in flight; refilled one-for-one as results are consumed so workers never idle at a batch boundary
+DECODE_QUEUE_DEPTH = 4 * DECODE_WORKERS
+
+# detected landmarks are buffered and written with one executemany per batch
+RAW_INSERT_BATCH_SIZE = 256
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff"})
+
 def init_database(db_path: Path):
     db_path.parent.mkdir(parents=True, exist_ok=True)
     _create_database(db_path)
 
-def ingest_raw_landmarks(db_path: Path, landmarker_path: Path, raw_images_path: Path, dataset_version: str) -> Dict[str, int]:
-    with sqlite3.connect(db_path) as conn:
+# detects hand landmarks for every <gesture>/<image> in the ZIP archive, decoding the images
+# straight from it instead of extracting them to disk first and reading each file back
+def ingest_raw_landmarks_from_zip(db_path: Path, landmarker_path: Path, zip_path: Path, dataset_version: str) -> Dict[str, int]:
+    with sqlite3.connect(db_path) as conn, zipfile.ZipFile(zip_path) as zf:
         cur = conn.cursor()
 
-        skipped = 0
         inserted = 0
         total = 0
+        pending = []
 
-        with _create_landmarker(landmarker_path) as landmarker:
-            for gesture_folder in raw_images_path.iterdir():
-                gesture_path = raw_images_path / gesture_folder
+        # ZipFile handles must not be shared between threads, so every decode worker opens its own
+        local = threading.local()
+        handles = []
 
-                if not gesture_path.is_dir():
-                    continue
+        def decode(member):
+            if not hasattr(local, "zf"):
+                local.zf = zipfile.ZipFile(zip_path)
+                handles.append(local.zf)
+            return _decode_zip_image(local.zf, member)
+
+        try:
+            with _create_landmarker(landmarker_path) as landmarker, ThreadPoolExecutor(DECODE_WORKERS) as executor:
+                remaining = _iter_zip_images(zf)
+                in_flight = deque()
+
+                def submit_next():
+                    item = next(remaining, None)
+                    if item is not None:
+                        in_flight.append((item, executor.submit(decode, item[2])))
+
+                for _ in range(DECODE_QUEUE_DEPTH):
+                    submit_next()
+
+                while in_flight:
+                    (gesture, image_path, member), future = in_flight.popleft()
+                    submit_next()
 
-                for file in gesture_path.iterdir():
                     total += 1
-                    image_path = gesture_path / file
-                    results = _extract_landmarks(image_path, landmarker)
-
-                    if not results.hand_landmarks:
-                        skipped += 1
-                        continue
-
-                    gesture = gesture_folder.name
-                    image_path = str(image_path.relative_to(raw_images_path))
-                    handedness = results.handedness[0][0].category_name
-                    landmarks = [[lm.x, lm.y, lm.z] for lm in results.hand_landmarks[0]]
-
-                    try:
-                        cur.execute("""
-                        INSERT INTO gestures_raw
-                        (gesture, image_path, handedness, landmarks, dataset_version)
-                        VALUES (?, ?, ?, ?, ?)
-                        """, (
-                            gesture,
-                            image_path,
-                            handedness,
-                            json.dumps(landmarks),
-                            dataset_version
-                        ))
-                        inserted += 1
-                    except sqlite3.IntegrityError:
-                        # Duplicate (dataset_version, image_path), skip or handle as needed
-                        skipped += 1
+                    results = _extract_landmarks_from_decoded(future.result(), member.filename, landmarker)
+
+                    row = _raw_landmarks_row(gesture, image_path, results, dataset_version)
+                    if row is not None:
+                        pending.append(row)
+                    if len(pending) >= RAW_INSERT_BATCH_SIZE:
+                        inserted += _insert_raw_landmarks(cur, pending)
+        finally:
+            for handle in handles:
+                handle.close()
+
+        inserted += _insert_raw_landmarks(cur, pending)
 
         return {
             "total": total,
             "inserted": inserted,
-            "skipped": skipped
+            "skipped": total - inserted
         }
 
+def _raw_landmarks_row(gesture: str, image_path: str, results, dataset_version: str):
+    if not results.hand_landmarks:
+        return None
+
+    handedness = results.handedness[0][0].category_name
+    landmarks = [[lm.x, lm.y, lm.z] for lm in results.hand_landmarks[0]]
+
+    return (
+        gesture,
+        image_path,
+        handedness,
+        json.dumps(landmarks),
+        dataset_version
+    )
+
+# writes and clears the buffered rows, returns how many were actually inserted
+def _insert_raw_landmarks(cur, rows: list) -> int:
+    if not rows:
+        return 0
+
+    # Duplicate (dataset_version, image_path) rows are ignored and count as skipped
+    cur.executemany("""
+    INSERT OR IGNORE INTO gestures_raw
+    (gesture, image_path, handedness, landmarks, dataset_version)
+    VALUES (?, ?, ?, ?, ?)
+    """, rows)
+    rows.clear()
+    return max(cur.rowcount, 0)
+
+# yields (gesture, image_path, member) for every <gesture>/<image> file in the archive
+# (an optional single root folder is skipped);
+# plain string splitting keeps this cheap for archives with tens of thousands of members
+def _iter_zip_images(zf: zipfile.ZipFile):
+    members = [info for info in zf.infolist() if not info.is_dir()]
+    segments = [info.filename.split("/") for info in members]
+
+    roots = {s[0] for s in segments}
+    depth = 1 if len(roots) == 1 and all(len(s) > 1 for s in segments) else 0
+
+    for info, s in zip(members, segments):
+        if len(s) - depth != 2:
+            continue
+        gesture, filename = s[depth], s[depth + 1]
+
+        # skip non-image entries (.DS_Store, Thumbs.db, ...) before they reach a decoder
+        dot = filename.rfind(".")
+        if dot < 0 or filename[dot:].lower() not in IMAGE_EXTENSIONS:
+            continue
+
+        yield gesture, f"{gesture}/{filename}", info
+
 def ingest_normalized_landmarks(db_path: Path, dataset_version: str) -> Dict[str, int]:
     with sqlite3.connect(db_path) as conn:
         cur = conn.cursor()
 
-        rows = cur.execute("""
+        # iterated lazily from its own cursor: rows are normalized and inserted as they are read
+        # instead of materializing every raw landmarks JSON string up front
+        rows = conn.execute("""
             SELECT id, gesture, image_path, handedness, landmarks 
             FROM gestures_raw
             WHERE dataset_version = ?
-        """, (dataset_version,)).fetchall()
+        """, (dataset_version,))
 
-        inserted = 0
+        valid = 0
         discarded = 0
-        label_stats = defaultdict(int)
 
-        for raw_id, gesture, image_path, handedness, landmarks_json in rows:
+        def normalized_rows():
+            nonlocal valid, discarded
 
-            normalized = _normalize_and_validate_row(landmarks_json, handedness)
-            if normalized is None:
-                discarded += 1
-                continue
+            for raw_id, gesture, image_path, handedness, landmarks_json in rows:
+                normalized = _normalize_and_validate_row(landmarks_json, handedness)
+                if normalized is None:
+                    discarded += 1
+                    continue
 
-            try:
-                cur.execute("""
-                INSERT INTO gestures_processed
-                (raw_id, gesture, image_path, handedness, landmarks, dataset_version)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+                valid += 1
+                yield (
                     raw_id,
                     gesture,
                     image_path,
                     handedness,
                     json.dumps(normalized.tolist()),
                     dataset_version
-                ))
-                inserted += 1
-                label_stats[gesture] += 1
-            except sqlite3.IntegrityError:
-                # Duplicate processed record for this dataset_version/image_path
-                discarded += 1
+                )
+
+        # single executemany inside the connection's transaction instead of one execute per row;
+        # duplicate processed records for this dataset_version/image_path are ignored, not raised
+        cur.executemany("""
+        INSERT OR IGNORE INTO gestures_processed
+        (raw_id, gesture, image_path, handedness, landmarks, dataset_version)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, normalized_rows())
+
+        inserted = max(cur.rowcount, 0)
+        discarded += valid - inserted
+
+        label_stats = dict(cur.execute("""
+            SELECT gesture, COUNT(*)
+            FROM gestures_processed
+            WHERE dataset_version = ?
+            GROUP BY gesture
+        """, (dataset_version,)).fetchall())
 
         return {
             "inserted": inserted,
             "discarded": discarded,
-            "label_stats": dict(label_stats)
+            "label_stats": label_stats
         }
 
 
@@ -178,6 +260,12 @@ def _create_database(db_path):
         )
         """)
 
+        # covers the per-version label counts (GROUP BY gesture) without touching the table
+        cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_gestures_processed_version_gesture
+        ON gestures_processed (dataset_version, gesture)
+        """)
+
 
 def _extract_landmarks(image_path, landmarker):
     image = cv2.imread(str(image_path))
@@ -186,6 +274,18 @@ def _extract_landmarks(image_path, landmarker):
         return mp.tasks.vision.HandLandmarkerResult(hand_landmarks=[], handedness=[], hand_world_landmarks=[])
     return _extract_landmarks_from_image(image, landmarker)
 
+def _decode_zip_image(zf: zipfile.ZipFile, member: zipfile.ZipInfo):
+    # decode from the member bytes directly, no temporary file or BytesIO copy
+    with zf.open(member) as source:
+        buffer = np.frombuffer(source.read(), np.uint8)
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+def _extract_landmarks_from_decoded(image, name: str, landmarker):
+    if image is None:
+        print(f"Warning: Could not decode image {name}, skipping.")
+        return mp.tasks.vision.HandLandmarkerResult(hand_landmarks=[], handedness=[], hand_world_landmarks=[])
+    return _extract_landmarks_from_image(image, landmarker)
+
 def _extract_landmarks_from_image(image: np.ndarray, landmarker):
     image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
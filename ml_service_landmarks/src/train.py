@@ -171,8 +171,13 @@ def train_model(args):
         }
 
         try:
-            with open(active_path, 'w') as f:
-                json.dump(active_data, f, indent=2)
+            # write then rename so readers never see a partial file
+            tmp_path = active_path.with_suffix(".json.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(active_data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, active_path)
             print(f"Set as active model: gesture_model_{version}.keras")
         except Exception as e:
             print(f"Failed to write active model file: {e}")
@@ -4,12 +4,14 @@
 # - Ahmet
 
 import pytest
+import cv2
 import numpy as np
 import sqlite3
 import json
 import tempfile
+import zipfile
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 from src.preprocess_data import (
     _normalize_landmarks,
@@ -20,7 +22,9 @@ from src.preprocess_data import (
     _create_database,
     _extract_landmarks,
     _extract_landmarks_from_image,
-    ingest_normalized_landmarks
+    _iter_zip_images,
+    ingest_normalized_landmarks,
+    ingest_raw_landmarks_from_zip
 )
 
 @pytest.fixture
@@ -147,6 +151,37 @@ def synthetic_image():
     return np.zeros((480, 640, 3), dtype=np.uint8)
 
 
+@pytest.fixture
+def png_bytes():
+    """Small encoded PNG, as it would be stored inside an uploaded ZIP"""
+    return cv2.imencode(".png", np.zeros((8, 8, 3), dtype=np.uint8))[1].tobytes()
+
+
+@pytest.fixture
+def make_zip(tmp_path):
+    """Write a ZIP with the given {member name: bytes} and return its path"""
+    def make(members, name="dataset.zip"):
+        zip_path = tmp_path / name
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for member, data in members.items():
+                zf.writestr(member, data)
+        return zip_path
+    return make
+
+
+@pytest.fixture
+def stub_landmarker(monkeypatch, valid_landmarks):
+    """Replace the MediaPipe landmarker: every image it sees has one right hand"""
+    landmarker = MagicMock()
+    landmarker.__enter__.return_value = landmarker
+    result = Mock()
+    result.hand_landmarks = [[Mock(x=x, y=y, z=0.0) for x, y in valid_landmarks]]
+    result.handedness = [[Mock(category_name="Right")]]
+    landmarker.detect.return_value = result
+    monkeypatch.setattr("src.preprocess_data._create_landmarker", lambda model_path: landmarker)
+    return landmarker
+
+
 class TestNormalizeLandmarks:
     """Test _normalize_landmarks function."""
     
@@ -494,6 +529,24 @@ class TestDatabaseSchema:
 
         conn.close()
 
+    def test_label_count_query_uses_covering_index(self, temp_db_path):
+        """37. Should count labels per dataset version from the covering index"""
+        _create_database(temp_db_path)
+
+        conn = sqlite3.connect(temp_db_path)
+        cur = conn.cursor()
+
+        cur.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT gesture, COUNT(*) FROM gestures_processed
+            WHERE dataset_version = ? GROUP BY gesture
+        """, ("v1",))
+        plan = " ".join(row[-1] for row in cur.fetchall())
+
+        assert "COVERING INDEX idx_gestures_processed_version_gesture" in plan
+
+        conn.close()
+
 class TestIngestNormalizedLandmarks:
     def test_ingest_normalized_landmarks_happy_path(self, temp_db_path, valid_landmarks):
         """32. Should normalize, and insert landmarsk correctly"""
@@ -619,3 +672,136 @@ class TestMockLandmarker:
 
         mock_landmarker.detect.assert_called_once()
         assert result is mock_landmarker.detect.return_value
+
+
+class TestIterZipImages:
+    """Test the _iter_zip_images member walker."""
+
+    def test_flat_layout(self, make_zip):
+        """38. <gesture>/<image> members at the top of the archive are yielded as is"""
+        zip_path = make_zip({"like/a.png": b"", "stop/b.jpg": b""})
+
+        with zipfile.ZipFile(zip_path) as zf:
+            items = [(gesture, image_path) for gesture, image_path, _ in _iter_zip_images(zf)]
+
+        assert sorted(items) == [("like", "like/a.png"), ("stop", "stop/b.jpg")]
+
+    def test_single_root_folder_is_skipped(self, make_zip):
+        """39. A single root folder around the gesture folders should not end up in the paths"""
+        zip_path = make_zip({"dataset/": b"", "dataset/like/a.png": b"", "dataset/stop/b.jpg": b""})
+
+        with zipfile.ZipFile(zip_path) as zf:
+            items = [(gesture, image_path, member.filename) for gesture, image_path, member in _iter_zip_images(zf)]
+
+        assert sorted(items) == [
+            ("like", "like/a.png", "dataset/like/a.png"),
+            ("stop", "stop/b.jpg", "dataset/stop/b.jpg"),
+        ]
+
+    def test_non_image_members_are_skipped(self, make_zip):
+        """40. Non-image files, directories and members at the wrong depth should be skipped"""
+        zip_path = make_zip({
+            "like/": b"",
+            "like/a.PNG": b"",
+            "like/.DS_Store": b"",
+            "like/notes.txt": b"",
+            "like/README": b"",
+            "readme.png": b"",
+            "like/nested/b.png": b"",
+        })
+
+        with zipfile.ZipFile(zip_path) as zf:
+            items = [image_path for _, image_path, _ in _iter_zip_images(zf)]
+
+        assert items == ["like/a.PNG"]
+
+
+class TestIngestRawLandmarksFromZip:
+    """Test ingest_raw_landmarks_from_zip with a stubbed landmarker."""
+
+    def _stored_rows(self, db_path):
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("""
+            SELECT gesture, image_path, handedness, dataset_version FROM gestures_raw ORDER BY image_path
+        """).fetchall()
+        conn.close()
+        return rows
+
+    def test_flat_layout_is_ingested(self, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """41. Every image of a flat archive should be stored with its gesture and path"""
+        _create_database(temp_db_path)
+        zip_path = make_zip({"like/a.png": png_bytes, "stop/b.png": png_bytes})
+
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+
+        assert stats == {"total": 2, "inserted": 2, "skipped": 0}
+        assert self._stored_rows(temp_db_path) == [
+            ("like", "like/a.png", "Right", "v1"),
+            ("stop", "stop/b.png", "Right", "v1"),
+        ]
+
+    def test_root_folder_is_ingested_without_root(self, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """42. Images under a single root folder should be stored with paths relative to it"""
+        _create_database(temp_db_path)
+        zip_path = make_zip({"dataset/like/a.png": png_bytes, "dataset/stop/b.png": png_bytes})
+
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+
+        assert stats == {"total": 2, "inserted": 2, "skipped": 0}
+        assert [row[1] for row in self._stored_rows(temp_db_path)] == ["like/a.png", "stop/b.png"]
+
+    def test_non_image_members_are_not_counted(self, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """43. Non-image members should neither reach the landmarker nor count towards the total"""
+        _create_database(temp_db_path)
+        zip_path = make_zip({
+            "like/a.png": png_bytes,
+            "like/.DS_Store": b"junk",
+            "stop/b.png": png_bytes,
+            "stop/notes.txt": b"junk",
+        })
+
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+
+        assert stats == {"total": 2, "inserted": 2, "skipped": 0}
+        assert stub_landmarker.detect.call_count == 2
+
+    def test_undecodable_image_is_skipped(self, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """44. An image that cannot be decoded should count as skipped without calling detect"""
+        _create_database(temp_db_path)
+        zip_path = make_zip({"like/a.png": png_bytes, "stop/broken.png": b"not an image"})
+
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+
+        assert stats == {"total": 2, "inserted": 1, "skipped": 1}
+        assert stub_landmarker.detect.call_count == 1
+        assert [row[1] for row in self._stored_rows(temp_db_path)] == ["like/a.png"]
+
+    def test_duplicate_rows_count_as_skipped(self, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """45. Ingesting the same archive twice into one dataset version should skip every duplicate"""
+        _create_database(temp_db_path)
+        zip_path = make_zip({"like/a.png": png_bytes, "stop/b.png": png_bytes})
+
+        ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), zip_path, "v1")
+
+        assert stats == {"total": 2, "inserted": 0, "skipped": 2}
+        assert len(self._stored_rows(temp_db_path)) == 2
+
+    def test_duplicates_counted_across_insert_batches(self, monkeypatch, temp_db_path, make_zip, png_bytes, stub_landmarker):
+        """46. Skipped duplicates should be counted correctly when rows are written in several batches"""
+        monkeypatch.setattr("src.preprocess_data.RAW_INSERT_BATCH_SIZE", 2)
+        _create_database(temp_db_path)
+        first = make_zip({"like/a.png": png_bytes, "stop/d.png": png_bytes}, name="first.zip")
+        second = make_zip({
+            "like/a.png": png_bytes,
+            "like/b.png": png_bytes,
+            "like/c.png": png_bytes,
+            "stop/d.png": png_bytes,
+            "stop/e.png": png_bytes,
+        }, name="second.zip")
+
+        ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), first, "v1")
+        stats = ingest_raw_landmarks_from_zip(temp_db_path, Path("model.task"), second, "v1")
+
+        assert stats == {"total": 5, "inserted": 3, "skipped": 2}
+        assert len(self._stored_rows(temp_db_path)) == 5
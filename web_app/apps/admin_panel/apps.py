@@ -1,10 +1,21 @@
 # Contributors:
 # - Mahmoud
 
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.admin_panel'
     verbose_name = 'Admin Panel'
+
+    def ready(self):
+        # Django does not create FILE_UPLOAD_TEMP_DIR itself, and an upload fails if it is missing
+        if settings.FILE_UPLOAD_TEMP_DIR:
+            try:
+                os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+            except OSError as e:
+                print(f"Could not create upload temp dir {settings.FILE_UPLOAD_TEMP_DIR}: {e}")
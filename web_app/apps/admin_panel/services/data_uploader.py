@@ -7,14 +7,20 @@ import sqlite3
 import requests
 import time
 import os
+import shutil
+import zipfile
 from pathlib import Path
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import Count
 from apps.core.models import Dataset
+from .http_session import session as _session
 
 
+# Seconds the ML service may hold each status request open before answering (long-poll)
+STATUS_LONG_POLL_WAIT = 30
+
 class DataUploader:
     """Service for uploading and processing labeled training data."""
     def handle_upload(self, uploaded_file: UploadedFile, dataset_version: str, user: None):
@@ -29,6 +35,11 @@ class DataUploader:
         """
         if not uploaded_file.name.lower().endswith('.zip'):
             raise ValueError("Only ZIP files are supported")
+
+        # Only reads the end-of-central-directory record, so a corrupt or renamed
+        # file is rejected before it is copied and shipped to the ML service
+        if not zipfile.is_zipfile(uploaded_file):
+            raise ValueError("Uploaded file is not a valid ZIP archive")
         
         if Dataset.objects.filter(version=dataset_version).exists():
             raise ValueError(f"Dataset version '{dataset_version}' already exists")
@@ -40,15 +51,13 @@ class DataUploader:
         fs_path = Path(settings.MEDIA_ROOT) / zip_filename
         fs_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(fs_path, 'wb+') as destination:
-            for chunk in uploaded_file.chunks():
-                destination.write(chunk)
+        self._store_upload(uploaded_file, fs_path)
                 
         # 2. Trigger Preprocessing via API
         ml_api_url = settings.ML_TRAINING_API_URL
         
         try:
-            resp = requests.post(
+            resp = _session.post(
                 f"{ml_api_url}/preprocess",
                 json={
                     "dataset_version": dataset_version,
@@ -67,24 +76,35 @@ class DataUploader:
             estimated_samples = file_size_mb * 100  # rough estimate
             estimated_time = max(60, min(600, int(estimated_samples / 35) + 30))  # 60s min, 600s max
             
-            # Poll for completion with dynamic timeout
-            for _ in range(estimated_time):
-                time.sleep(1)
-                status_resp = requests.get(f"{ml_api_url}/preprocess/{job_id}", timeout=5)
+            # Wait for completion with dynamic timeout. The ML service answers as soon as
+            # the job finishes, so there is no sleep between requests.
+            deadline = time.monotonic() + estimated_time
+            while (remaining := deadline - time.monotonic()) > 0:
+                wait = min(STATUS_LONG_POLL_WAIT, remaining)
+                status_resp = _session.get(
+                    f"{ml_api_url}/preprocess/{job_id}",
+                    params={'wait': wait},
+                    timeout=wait + 5
+                )
                 status_data = status_resp.json()
                 
                 if status_data['status'] == 'completed':
                     # Return stats
                     stats = status_data['message']
-                    dataset = Dataset.objects.create(
-                        version=dataset_version,
-                        uploaded_by=user,
-                        raw_samples=stats['total_raw_samples'],
-                        raw_preprocessed_samples=stats['total_preprocessed_samples'],
-                        validated_preprocessed_samples=stats['valid_preprocessed_samples'],
-                        zip_filename=zip_filename,
-                        label_stats=stats["label_stats"]
-                    )
+                    # Dataset.version is unique: a concurrent upload of the same version that
+                    # slipped past the early check is caught here, in the INSERT itself
+                    try:
+                        dataset = Dataset.objects.create(
+                            version=dataset_version,
+                            uploaded_by=user,
+                            raw_samples=stats['total_raw_samples'],
+                            raw_preprocessed_samples=stats['total_preprocessed_samples'],
+                            validated_preprocessed_samples=stats['valid_preprocessed_samples'],
+                            zip_filename=zip_filename,
+                            label_stats=stats["label_stats"]
+                        )
+                    except IntegrityError:
+                        raise ValueError(f"Dataset version '{dataset_version}' already exists")
 
                     return {'total': stats['total_raw_samples'], 'dataset': dataset}
                     
@@ -99,4 +119,24 @@ class DataUploader:
             # Optional: Delete zip after successful handoff if desired, 
             # but user might want to keep it as backup. 
             # Current plan says "keep zip", so we leave it.
-            pass
\ No newline at end of file
+            pass
+
+    @staticmethod
+    def _store_upload(uploaded_file: UploadedFile, fs_path: Path):
+        """
+        Place the uploaded ZIP at fs_path.
+
+        Uploads are always spooled to disk by Django (FILE_UPLOAD_HANDLERS), so they are
+        hard-linked into MEDIA_ROOT instead of being read and written a second time. Temp
+        files on another filesystem are copied file to file.
+        """
+        source_path = uploaded_file.temporary_file_path()
+        try:
+            os.link(source_path, fs_path)
+        except OSError:
+            # EXDEV (different device) or no hard-link support: copy file to file, which
+            # shutil does in the kernel (sendfile) rather than through Python buffers
+            shutil.copyfile(source_path, fs_path)
+        else:
+            # Django creates temp files as 0600; the ML service must be able to read the ZIP
+            os.chmod(fs_path, 0o644)
@@ -0,0 +1,35 @@
+# Contributors:
+# - Mahmoud
+
+"""Shared HTTP session for calls from the admin panel to the ML services.
+
+Every service module goes through the same sessions, so status polls, training
+requests and reloads reuse kept-alive connections instead of opening a new
+socket per call.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Retry transient errors while an ML container restarts, with jittered exponential
+# backoff so several workers don't retry in lockstep, and honour Retry-After.
+# Connection failures are retried for every method (nothing was sent yet), but status
+# and read retries stay limited to idempotent methods: a POST that starts a job is
+# never sent twice.
+_retries = Retry(
+    total=3,
+    backoff_factor=0.5,
+    backoff_jitter=0.25,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+)
+
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=_retries))
+
+# For requests a page load waits on (/train, the training status checks) or that are
+# fire-and-forget (/reload): when the service is down they fail at once instead of sitting
+# through the backoff above
+session_no_retry = requests.Session()
+session_no_retry.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
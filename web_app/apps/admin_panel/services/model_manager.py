@@ -5,12 +5,36 @@
 """Model management service for deploying, rolling back, and comparing models."""
 from django.utils import timezone
 from django.conf import settings
+from django.db import connections, transaction
+from functools import lru_cache
 from pathlib import Path
 import os
 import json
-import requests
-import sqlite3
 from apps.core.models import ModelVersion
+from .http_session import session_no_retry as _session_no_retry
+
+
+def get_active_model_file(active_model_file: Path):
+    """
+    Return the model_file named in active_model.json, or None if it is missing or unreadable.
+
+    The parsed value is cached per file identity (inode + mtime), so repeated lookups cost a
+    single stat() until the file is replaced.
+    """
+    try:
+        st = os.stat(active_model_file)
+    except OSError:
+        return None
+    return _read_active_model_file(str(active_model_file), st.st_ino, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _read_active_model_file(path: str, inode: int, mtime_ns: int):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('model_file')
+    except (OSError, ValueError, AttributeError):
+        return None
 
 
 class ModelManager:
@@ -33,16 +57,26 @@ class ModelManager:
                 "Models must be trained with data before deployment."
             )
         
-        # Deactivate all other models
-        ModelVersion.objects.filter(is_active=True).update(is_active=False)
-        
-        # Activate this model
+        now = timezone.now()
+        if notes:
+            model.notes = f"{model.notes}\n\n[{now}] Deployment: {notes}" if model.notes else notes
         model.is_active = True
-        model.deployment_date = timezone.now()
+        model.deployment_date = now
         model.deployed_by = user
-        if notes:
-            model.notes = f"{model.notes}\n\n[{timezone.now()}] Deployment: {notes}" if model.notes else notes
-        model.save()
+        model.updated_at = now
+
+        with transaction.atomic():
+            # Deactivate all other models
+            ModelVersion.objects.filter(is_active=True).update(is_active=False)
+
+            # Activate this model, writing only the deployment columns
+            ModelVersion.objects.filter(pk=model.pk).update(
+                is_active=True,
+                deployment_date=now,
+                deployed_by=user,
+                notes=model.notes,
+                updated_at=now,  # update() bypasses auto_now
+            )
         
         # Update the active_model.json file (read by inference service)
         model_path = Path(settings.MODEL_PATH)
@@ -51,13 +85,28 @@ class ModelManager:
             "model_file": model.model_file,
             "class_names": ModelManager._get_class_names_from_model(model)
         }
-        with open(active_model_file, 'w') as f:
-            json.dump(active_data, f, indent=2)
+        try:
+            with open(active_model_file, 'r') as f:
+                current_data = json.load(f)
+        except (OSError, ValueError):
+            current_data = None
+
+        # The file already holds exactly this deployment: nothing to rewrite. Any difference
+        # (e.g. stale class names) is repaired by redeploying the same model.
+        if current_data != active_data:
+            # Write a sibling temp file and rename it over the old one, so the inference
+            # service never reads a half-written file
+            tmp_file = active_model_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(active_data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, active_model_file)
         
         # Call inference servioce to update the model
         inference_url = os.getenv('ML_INFERENCE_API_URL', 'http://ml-inference-landmarks:8002')
         try:
-            requests.post(f"{inference_url}/reload", timeout=5)
+            _session_no_retry.post(f"{inference_url}/reload", timeout=5)
         except Exception as e:
             print(f"Failed to notify inference service at {inference_url}/reload: {e}")
         
@@ -83,6 +132,28 @@ class ModelManager:
         """Get the currently active model."""
         return ModelVersion.objects.filter(is_active=True).first()
 
+    @staticmethod
+    def get_active_model_summary():
+        """
+        Get the version_id and test_accuracy of the active model, for display.
+
+        Returns:
+            Dict with version_id and test_accuracy, empty if no model is active
+        """
+        return ModelVersion.objects.filter(is_active=True).values('version_id', 'test_accuracy').first() or {}
+
+    @staticmethod
+    def get_model_summaries():
+        """
+        Get the compare-page fields of every model version, newest first.
+
+        Returns:
+            List of dicts with id, version_id, is_active, test_accuracy, epochs and batch_size
+        """
+        return list(ModelVersion.objects.order_by('-created_at').values(
+            'id', 'version_id', 'is_active', 'test_accuracy', 'epochs', 'batch_size'
+        ))
+
     @staticmethod
     def delete_model(model: ModelVersion):
         """
@@ -113,15 +184,23 @@ class ModelManager:
     @staticmethod
     def _get_class_names_from_model(model: ModelVersion):
         """
-        Get the class names for a model by reading from landmarks database.
-        
-        The actual class names are determined at training time from the database.
-        We read them from the gestures_processed table.
+        Get the class names for a model.
+
+        Training records the labels in output-index order on the ModelVersion, so
+        they are read from there. Older models without class_labels fall back to the
+        gestures in the landmarks database (read once per deploy).
         """
+        if model.class_labels:
+            return list(model.class_labels)
+
+        return ModelManager._query_class_names()
+
+    @staticmethod
+    def _query_class_names():
+        """Read the distinct gestures from the gestures_processed table."""
         try:
-            db_path = settings.DATABASES['landmarks']['NAME']
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
+            # Django's per-thread 'landmarks' connection is reused instead of opening the file each call
+            with connections['landmarks'].cursor() as cursor:
                 cursor.execute("SELECT DISTINCT gesture FROM gestures_processed ORDER BY gesture")
                 return [row[0] for row in cursor.fetchall()]
         except Exception:
@@ -13,14 +13,25 @@ import requests
 from datetime import datetime
 from django.utils import timezone
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from pathlib import Path
 
 from apps.core.models import TrainingRun, ModelVersion
+from .http_session import session_no_retry as _session_no_retry
+from .model_manager import get_active_model_file
 
 
 # URL for the ML Training API service
 ML_TRAINING_API_URL = os.getenv('ML_TRAINING_API_URL', 'http://ml-training:8003')
 
+# Shared stand-in for metric sections missing from the trainer's output (read-only)
+_EMPTY = {}
+
+
+def _pct(value):
+    """Convert a 0-1 metric to a percentage, treating a missing value as 0."""
+    return (value or 0) * 100
+
 
 
 class TrainingService:
@@ -61,7 +72,7 @@ class TrainingService:
 
         # Call the ML Training API
         try:
-            response = requests.post(
+            response = _session_no_retry.post(
                 f"{self.api_url}/train",
                 json=api_payload,
                 timeout=30
@@ -106,10 +117,19 @@ class TrainingService:
         if training_run.status not in ['pending', 'running']:
             raise ValueError(f"Cannot cancel training in status: {training_run.status}")
 
-        # Note: The current API doesn't support cancellation, so we just mark it locally
+        # Note: The current API doesn't support cancellation, so we just mark it locally.
+        # The status guard in the UPDATE keeps a run that finished meanwhile from being cancelled.
+        now = timezone.now()
+        updated = TrainingRun.objects.filter(
+            pk=training_run.pk, status__in=['pending', 'running']
+        ).update(status='cancelled', completed_at=now, updated_at=now)
+        if not updated:
+            training_run.refresh_from_db(fields=['status'])
+            raise ValueError(f"Cannot cancel training in status: {training_run.status}")
+
         training_run.status = 'cancelled'
-        training_run.completed_at = timezone.now()
-        training_run.save()
+        training_run.completed_at = now
+        training_run.updated_at = now
 
     def check_training_status(self, training_run: TrainingRun):
         """
@@ -120,6 +140,8 @@ class TrainingService:
 
         Returns:
             Updated status
+
+        Each branch saves only the columns it changes (status_etag included).
         """
         if training_run.status not in ['running', 'pending']:
             return training_run.status
@@ -127,58 +149,33 @@ class TrainingService:
         job_id = training_run.run_id
 
         try:
-            response = requests.get(
+            # The ML API answers 304 while the job is unchanged since the last check, which
+            # skips the body, the logs request and the save below
+            last_etag = training_run.status_etag
+            response = _session_no_retry.get(
                 f"{self.api_url}/train/{job_id}",
+                params={'include_logs': 1},
+                headers={'If-None-Match': last_etag} if last_etag else None,
                 timeout=10
             )
 
+            if response.status_code == 304:
+                return training_run.status
+
             if response.status_code == 404:
-                training_run.status = 'failed'
-                training_run.completed_at = timezone.now()
-                training_run.error_message = 'Training job missing from ML API.'
-                training_run.save()
+                self._mark_job_missing(training_run)
                 return training_run.status
 
             response.raise_for_status()
             job_data = response.json()
+            etag = response.headers.get('ETag')
+            etag_changed = bool(etag) and etag != training_run.status_etag
+            if etag_changed:
+                training_run.status_etag = etag
 
-            api_status = job_data.get('status', 'pending')
-
-            if api_status == 'completed':
-                training_run.status = 'completed'
-                training_run.completed_at = timezone.now()
-                training_run.logs = job_data.get('stdout', '')
-                metrics = job_data.get('metrics')
-                if metrics:
-                    training_run.final_metrics = metrics
-                try:
-                    self._link_model_version(training_run, metrics)
-                except Exception as e:
-                    training_run.error_message = f"Training completed but model linking failed: {e}"
-                training_run.save()
-
-            elif api_status == 'failed':
-                training_run.status = 'failed'
-                training_run.completed_at = timezone.now()
-                training_run.error_message = job_data.get('error', 'Unknown error')
-                training_run.logs = job_data.get('stderr', '')
-                training_run.save()
-            elif api_status == 'running':
-                training_run.status = 'running'
-                if not training_run.started_at:
-                    training_run.started_at = timezone.now()
-                # Try to fetch current logs
-                try:
-                    logs_response = requests.get(
-                        f"{self.api_url}/train/{job_id}/logs",
-                        timeout=10
-                    )
-                    if logs_response.status_code == 200:
-                        logs_data = logs_response.json()
-                        training_run.logs = logs_data.get('stdout', '') + logs_data.get('stderr', '')
-                except requests.exceptions.RequestException:
-                    pass
-                training_run.save()
+            if not self._apply_job_data(training_run, job_data) and etag_changed:
+                # Remember the ETag without touching updated_at
+                training_run.save(update_fields=['status_etag'])
 
         except requests.exceptions.RequestException:
             # API unavailable, keep current status
@@ -186,6 +183,99 @@ class TrainingService:
 
         return training_run.status
 
+    def check_training_statuses(self, training_runs):
+        """
+        Check several training runs with a single request to the ML Training API.
+
+        Args:
+            training_runs: Iterable of TrainingRun instances (finished runs are skipped)
+
+        Returns:
+            Dict mapping each checked run's pk to its updated status
+        """
+        runs = [run for run in training_runs if run.status in ['running', 'pending']]
+        if not runs:
+            return {}
+
+        try:
+            response = _session_no_retry.get(
+                f"{self.api_url}/train",
+                params={'job_id': [run.run_id for run in runs]},
+                timeout=10
+            )
+            response.raise_for_status()
+            jobs = {job['id']: job for job in response.json().get('jobs', [])}
+        except requests.exceptions.RequestException:
+            # API unavailable, keep current statuses
+            return {run.pk: run.status for run in runs}
+
+        for run in runs:
+            job_data = jobs.get(run.run_id)
+            if job_data is None:
+                self._mark_job_missing(run)
+            else:
+                self._apply_job_data(run, job_data)
+
+        return {run.pk: run.status for run in runs}
+
+    def _mark_job_missing(self, training_run: TrainingRun):
+        """Fail a run whose job the ML API no longer knows (e.g. after a restart)."""
+        training_run.status = 'failed'
+        training_run.completed_at = timezone.now()
+        training_run.error_message = 'Training job missing from ML API.'
+        training_run.save(update_fields=['status', 'completed_at', 'error_message', 'updated_at'])
+
+    def _apply_job_data(self, training_run: TrainingRun, job_data: dict):
+        """
+        Update a training run from the ML API's job record (stdout/stderr included).
+
+        Args:
+            training_run: TrainingRun instance
+            job_data: Job dict as returned by the ML Training API
+
+        Returns:
+            True if the run was saved, False if nothing changed
+        """
+        api_status = job_data.get('status', 'pending')
+
+        if api_status == 'completed':
+            training_run.status = 'completed'
+            training_run.completed_at = timezone.now()
+            training_run.logs = job_data.get('stdout', '')
+            metrics = job_data.get('metrics')
+            if metrics:
+                training_run.final_metrics = metrics
+            try:
+                self._link_model_version(training_run, metrics)
+            except Exception as e:
+                training_run.error_message = f"Training completed but model linking failed: {e}"
+            training_run.save(update_fields=[
+                'status', 'completed_at', 'logs', 'final_metrics', 'model_version',
+                'error_message', 'status_etag', 'updated_at',
+            ])
+
+        elif api_status == 'failed':
+            training_run.status = 'failed'
+            training_run.completed_at = timezone.now()
+            training_run.error_message = job_data.get('error', 'Unknown error')
+            training_run.logs = job_data.get('stderr', '')
+            training_run.save(update_fields=['status', 'completed_at', 'error_message', 'logs', 'status_etag', 'updated_at'])
+        elif api_status == 'running':
+            # Current logs come with the status (include_logs), no second request
+            logs = job_data.get('stdout', '') + job_data.get('stderr', '')
+            if training_run.status == 'running' and training_run.started_at and training_run.logs == logs:
+                # Nothing visible changed: saving would only bump updated_at, which is part
+                # of the training_status page's ETag
+                return False
+            training_run.status = 'running'
+            if not training_run.started_at:
+                training_run.started_at = timezone.now()
+            training_run.logs = logs
+            training_run.save(update_fields=['status', 'started_at', 'logs', 'status_etag', 'updated_at'])
+        else:
+            return False
+        return True
+
     def _link_model_version(self, training_run: TrainingRun, metrics=None):
         """
         Link training run to the created model version.
@@ -193,65 +283,71 @@ class TrainingService:
         Args:
             training_run: TrainingRun instance
         """
-        version_name = training_run.config.get('version_name')
+        run_config = training_run.config or {}
+        version_name = run_config.get('version_name')
 
         if not version_name:
             return
 
         # Expected artifact file name produced by trainer
         # train.py saves to: gesture_model_{version}.keras
-        model_filename = f"gesture_model_{version_name}.keras"
-        version_id = Path(model_filename).stem
+        version_id = f"gesture_model_{version_name}"
+        model_filename = f"{version_id}.keras"
 
         # Try to find an existing ModelVersion first
         model_version = ModelVersion.objects.filter(version_id=version_id).first()
 
         if not model_version:
             # Determine if this model was set active by trainer (active_model.json)
-            model_path = Path(settings.MODEL_PATH)
-            active_file = model_path / 'active_model.json'
-            is_active = False
-            if active_file.exists():
-                try:
-                    import json
-                    with open(active_file, 'r') as f:
-                        active_data = json.load(f)
-                    is_active = (active_data.get('model_file') == model_filename)
-                except Exception:
-                    is_active = False
-
-            if is_active:
-                ModelVersion.objects.filter(is_active=True).update(is_active=False)
-
-            model_version = ModelVersion.objects.create(
-                version_id=version_id,
-                model_file=model_filename,
-                framework='tensorflow',
-                training_date=timezone.now(),
-                # Dataset info
-                class_labels=(metrics or {}).get('dataset', {}).get('class_labels') or [],
-                train_dataset_size=(metrics or {}).get('dataset', {}).get('train_count') or 0,
-                test_dataset_size=(metrics or {}).get('dataset', {}).get('test_count') or 0,
-                validation_dataset_size=(metrics or {}).get('dataset', {}).get('validation_count') or 0,
-                # Hyperparameters
-                # Create a new ModelVersion entry from training contexs
-                learning_rate=training_run.config["learning_rate"],
-                epochs=(metrics or {}).get('config', {}).get('epochs') or training_run.config.get('epochs') or 0,
-                batch_size=(metrics or {}).get('config', {}).get('batch_size') or training_run.config.get('batch_size') or 0,
-                # Metrics - convert from 0-1 scale to percentage (0-100)
-                train_accuracy=((metrics or {}).get('train', {}).get('accuracy') or 0) * 100,
-                validation_accuracy=((metrics or {}).get('validation', {}).get('accuracy') or 0) * 100,
-                test_accuracy=((metrics or {}).get('test', {}).get('accuracy') or 0) * 100,
-                train_loss=(metrics or {}).get('train', {}).get('loss'),
-                validation_loss=(metrics or {}).get('validation', {}).get('loss'),
-                test_loss=(metrics or {}).get('test', {}).get('loss'),
-                test_precision=((metrics or {}).get('test', {}).get('precision') or 0) * 100,
-                test_recall=((metrics or {}).get('test', {}).get('recall') or 0) * 100,
-                test_f1_score=((metrics or {}).get('test', {}).get('f1_score') or 0) * 100,
-                confusion_matrix=(metrics or {}).get('test', {}).get('confusion_matrix'),
-                is_active=is_active,
-                description=training_run.config.get('description', ''),
-            )
+            active_file = Path(settings.MODEL_PATH) / 'active_model.json'
+            is_active = (get_active_model_file(active_file) == model_filename)
+
+            m = metrics or {}
+            dataset_metrics = m.get('dataset') or _EMPTY
+            config_metrics = m.get('config') or _EMPTY
+            train_metrics = m.get('train') or _EMPTY
+            validation_metrics = m.get('validation') or _EMPTY
+            test_metrics = m.get('test') or _EMPTY
+
+            # Deactivating the previous model and inserting this one commit together. If a
+            # concurrent status check linked the run first, the unique version_id rejects this
+            # insert (rolling back the deactivation too) and its row is used instead.
+            try:
+                with transaction.atomic():
+                    if is_active:
+                        ModelVersion.objects.filter(is_active=True).update(is_active=False)
+
+                    model_version = ModelVersion.objects.create(
+                        version_id=version_id,
+                        model_file=model_filename,
+                        framework='tensorflow',
+                        training_date=timezone.now(),
+                        # Dataset info
+                        class_labels=dataset_metrics.get('class_labels') or [],
+                        train_dataset_size=dataset_metrics.get('train_count') or 0,
+                        test_dataset_size=dataset_metrics.get('test_count') or 0,
+                        validation_dataset_size=dataset_metrics.get('validation_count') or 0,
+                        # Hyperparameters
+                        # Create a new ModelVersion entry from training contexs
+                        learning_rate=run_config["learning_rate"],
+                        epochs=config_metrics.get('epochs') or run_config.get('epochs') or 0,
+                        batch_size=config_metrics.get('batch_size') or run_config.get('batch_size') or 0,
+                        # Metrics - convert from 0-1 scale to percentage (0-100)
+                        train_accuracy=_pct(train_metrics.get('accuracy')),
+                        validation_accuracy=_pct(validation_metrics.get('accuracy')),
+                        test_accuracy=_pct(test_metrics.get('accuracy')),
+                        train_loss=train_metrics.get('loss'),
+                        validation_loss=validation_metrics.get('loss'),
+                        test_loss=test_metrics.get('loss'),
+                        test_precision=_pct(test_metrics.get('precision')),
+                        test_recall=_pct(test_metrics.get('recall')),
+                        test_f1_score=_pct(test_metrics.get('f1_score')),
+                        confusion_matrix=test_metrics.get('confusion_matrix'),
+                        is_active=is_active,
+                        description=run_config.get('description', ''),
+                    )
+            except IntegrityError:
+                model_version = ModelVersion.objects.get(version_id=version_id)
 
         training_run.model_version = model_version
         if not training_run.final_metrics:
@@ -10,20 +10,20 @@ import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.utils import timezone
-from django.db.models import Count, Avg, Q
+from django.utils.html import escape
+from django.db.models import Count, Sum, Q, FloatField, Func
 from datetime import datetime, timedelta
 import os
 import zipfile
 import shutil
 
-from matplotlib.colors import LinearSegmentedColormap
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-import io
-import base64
+import hashlib
 
 from pathlib import Path
 
@@ -34,6 +34,98 @@ from .services.training_service import TrainingService
 from .services.data_uploader import DataUploader
 
 
+# Prediction aggregates are cached per minute bucket; an admin page may lag by up to a minute
+STATS_CACHE_TTL = 60
+
+# Rendered confusion matrices are keyed by a hash of the matrix, so they never go stale
+CONFUSION_MATRIX_CACHE_TTL = 24 * 60 * 60
+
+# Dark theme colour ramp for the confusion matrix heatmap (lowest count, highest count)
+CONFUSION_MATRIX_COLORS = ((0x2c, 0x33, 0x55), (0x6f, 0x5b, 0xdc))
+
+
+# Active training runs are synced with the ML API at most this often (seconds), whichever page
+# triggers it; training_status reloads itself on the same interval while a run is active
+TRAINING_SYNC_INTERVAL = 10
+TRAINING_SYNC_CACHE_KEY = 'training:status_sync'
+
+# Rows per page on the model versions list
+MODELS_PER_PAGE = 25
+
+
+def _minute_bucket():
+    """Cache key component that changes once a minute."""
+    return int(timezone.now().timestamp() // 60)
+
+
+def _sync_training_runs(runs):
+    """
+    Refresh running/pending training runs from the ML Training API.
+
+    Coalesced across requests: cache.add only succeeds for the first caller in each
+    TRAINING_SYNC_INTERVAL, every other page load skips the API round trips.
+
+    Args:
+        runs: Iterable of TrainingRun instances (a queryset is only evaluated when syncing)
+    """
+    if not cache.add(TRAINING_SYNC_CACHE_KEY, True, TRAINING_SYNC_INTERVAL):
+        return
+
+    active_runs = [run for run in runs if run.status in ['running', 'pending']]
+    service = TrainingService()
+    try:
+        if len(active_runs) == 1:
+            # A single run keeps its conditional request, usually answered 304
+            service.check_training_status(active_runs[0])
+        elif active_runs:
+            # All active runs in one ML API request instead of one each
+            service.check_training_statuses(active_runs)
+    except Exception:
+        pass  # Don't block page load for API errors
+
+
+class _PercentOfGroups(Func):
+    """
+    Share of all rows that falls into each GROUP BY group, in percent rounded to 1 decimal.
+
+    SUM(COUNT(*)) OVER () is the grand total across the groups, so a grouped query returns its
+    percentages without a separate COUNT first. The ORM cannot nest Count in a window Sum,
+    hence the raw template.
+    """
+    template = 'ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1)'
+    contains_aggregate = True
+    output_field = FloatField()
+
+    def get_group_by_cols(self):
+        return []
+
+
+def _class_distribution(predictions):
+    """
+    Per-class breakdown of a Prediction queryset in one grouped query.
+
+    The total and the average confidence are rolled up from the per-class counts and
+    confidence sums, so they need no query of their own.
+
+    Args:
+        predictions: Filtered Prediction queryset
+
+    Returns:
+        Dict with total, avg_conf and class_distribution (predicted_class, count, percentage rows)
+    """
+    rows = list(predictions.values('predicted_class').annotate(
+        count=Count('id'), confidence_sum=Sum('confidence'), percentage=_PercentOfGroups()
+    ).order_by('-count'))
+    total = sum(row['count'] for row in rows)
+    confidence_sum = sum(row.pop('confidence_sum') for row in rows)
+
+    return {
+        'total': total,
+        'avg_conf': confidence_sum / total if total else 0,
+        'class_distribution': rows,
+    }
+
+
 def is_staff_or_superuser(user):
     """Check if user is staff or superuser."""
     return user.is_staff or user.is_superuser
@@ -43,55 +135,38 @@ def is_staff_or_superuser(user):
 @user_passes_test(is_staff_or_superuser)
 def dashboard(request):
     """Admin dashboard with overview of system status."""
-    # Get active model
-    active_model = ModelVersion.objects.filter(is_active=True).first()
-
-    # Get recent predictions
-    recent_predictions = Prediction.objects.select_related('model_version').order_by('-created_at')[:10]
-
-    # Get prediction stats (last 24 hours)
-    yesterday = timezone.now() - timedelta(hours=24)
-    predictions_24h = Prediction.objects.filter(created_at__gte=yesterday).count()
-    avg_confidence_24h = Prediction.objects.filter(
-        created_at__gte=yesterday
-    ).aggregate(avg_conf=Avg('confidence'))['avg_conf'] or 0
-
-    # Get training runs
-    active_training = TrainingRun.objects.filter(status='running').first()
-    recent_trainings = TrainingRun.objects.order_by('-created_at')[:5]
-
-    # Get model count
-    total_models = ModelVersion.objects.count()
+    # Get active model (the template only shows its version and accuracy)
+    active_model = ModelManager.get_active_model_summary()
+
+    # Get recent predictions. model_version is the only relation the template follows, and only
+    # for its version_id, so the join does not drag in the model's JSON columns.
+    recent_predictions = Prediction.objects.select_related('model_version').only(
+        'created_at', 'predicted_class', 'confidence', 'model_version__version_id'
+    ).order_by('-created_at')[:10]
+
+    def dashboard_stats():
+        # Prediction distribution by class (last 24 hours). The window starts on the minute,
+        # so it is the same whichever request in the cache bucket computes it.
+        yesterday = timezone.now().replace(second=0, microsecond=0) - timedelta(hours=24)
+        stats = _class_distribution(Prediction.objects.filter(created_at__gte=yesterday))
+        # Get model count
+        stats['total_models'] = ModelVersion.objects.count()
+        return stats
+
+    dash_stats = cache.get_or_set(f"dash:{_minute_bucket()}", dashboard_stats, STATS_CACHE_TTL)
 
     # Get dataset stats
     stats = Dataset.get_latest_statistics()
     total_samples = stats['total_samples']
 
-    # Prediction distribution by class (last 24h)
-    class_distribution = Prediction.objects.filter(
-        created_at__gte=yesterday
-    ).values('predicted_class').annotate(count=Count('id')).order_by('-count')
-
-    # Calculate percentages
-    class_dist_with_percentage = []
-    for item in class_distribution:
-        percentage = (item['count'] * 100 / predictions_24h) if predictions_24h > 0 else 0
-        class_dist_with_percentage.append({
-            'predicted_class': item['predicted_class'],
-            'count': item['count'],
-            'percentage': round(percentage, 1)
-        })
-
     context = {
         'active_model': active_model,
         'recent_predictions': recent_predictions,
-        'predictions_24h': predictions_24h,
-        'avg_confidence_24h': avg_confidence_24h,
-        'active_training': active_training,
-        'recent_trainings': recent_trainings,
-        'total_models': total_models,
+        'predictions_24h': dash_stats['total'],
+        'avg_confidence_24h': dash_stats['avg_conf'],
+        'total_models': dash_stats['total_models'],
         'total_samples': total_samples,
-        'class_distribution': class_dist_with_percentage,
+        'class_distribution': dash_stats['class_distribution'],
     }
 
     return render(request, 'admin_panel/dashboard.html', context)
@@ -103,21 +178,21 @@ def models_list(request):
     """List all model versions."""
     # Sync any completed training runs that might not have models linked yet
     # This handles the case where user navigates directly to models without visiting training status
-    service = TrainingService()
+    # logs stays loaded: the sync compares it to skip saving runs that did not change
     pending_sync_runs = TrainingRun.objects.filter(
         status__in=['running', 'pending'],
-    ).select_related('model_version')
-
-    for run in pending_sync_runs:
-        try:
-            service.check_training_status(run)
-        except Exception:
-            pass  # Don't block page load for API errors
+    )
+    _sync_training_runs(pending_sync_runs)
 
-    models = ModelVersion.objects.all()
+    # Only the columns the list renders; the JSON blobs (confusion matrix, labels) stay in the database.
+    # One page at a time: a COUNT plus a LIMIT/OFFSET query, however many models exist.
+    models = ModelVersion.objects.only(
+        'version_id', 'is_active', 'test_accuracy', 'training_date', 'epochs', 'train_dataset_size'
+    )
+    page = Paginator(models, MODELS_PER_PAGE).get_page(request.GET.get('page'))
 
     context = {
-        'models': models,
+        'models': page,
     }
 
     return render(request, 'admin_panel/models_list.html', context)
@@ -127,34 +202,29 @@ def models_list(request):
 @user_passes_test(is_staff_or_superuser)
 def model_detail(request, model_id):
     """View details of a specific model."""
-    model = get_object_or_404(ModelVersion, id=model_id)
+    # The template shows who trained and deployed the model
+    model = get_object_or_404(ModelVersion.objects.select_related('trained_by', 'deployed_by'), id=model_id)
 
-    # Get predictions made by this model
-    predictions = model.predictions.order_by('-created_at')[:100]
-    prediction_count = model.predictions.count()
-    avg_confidence = model.predictions.aggregate(avg=Avg('confidence'))['avg'] or 0
-
-    # Get class distribution
-    class_dist = model.predictions.values('predicted_class').annotate(
-        count=Count('id')
-    ).order_by('-count')
-
-    # Calculate percentages
-    class_dist_with_percentage = []
-    for item in class_dist:
-        percentage = (item['count'] * 100 / prediction_count) if prediction_count > 0 else 0
-        class_dist_with_percentage.append({
-            'predicted_class': item['predicted_class'],
-            'count': item['count'],
-            'percentage': round(percentage, 1)
-        })
+    # Get predictions made by this model. The table shows the latest 20 and four columns, so
+    # fetch plain rows for exactly that (no landmarks JSON, no model instances).
+    predictions = list(model.predictions.values(
+        'created_at', 'predicted_class', 'confidence', 'inference_time_ms'
+    ).order_by('-created_at')[:20])
 
-    # Generate confusion matrix image if available
+    # Get class distribution, with the prediction count and average confidence
+    prediction_stats = _class_distribution(model.predictions.all())
+
+    # Generate confusion matrix image if available. The SVG only depends on the matrix and
+    # labels, so it is cached under their hash.
     cm = model.confusion_matrix
     labels = model.class_labels
     if model.confusion_matrix and model.class_labels:
-        cm = np.array(model.confusion_matrix)
-        cm_image = plot_confusion_matrix(cm, labels)
+        cm_hash = hashlib.md5(json.dumps([cm, labels]).encode()).hexdigest()
+        cm_key = f"cm:{model.id}:{cm_hash}"
+        cm_image = cache.get(cm_key)
+        if cm_image is None:
+            cm_image = plot_confusion_matrix(cm, labels)
+            cache.set(cm_key, cm_image, CONFUSION_MATRIX_CACHE_TTL)
     else:
         cm_image = None
 
@@ -162,49 +232,68 @@ def model_detail(request, model_id):
         'model': model,
         'predictions': predictions,
         'cm_image': cm_image,
-        'prediction_count': prediction_count,
-        'avg_confidence': avg_confidence,
-        'class_dist': class_dist_with_percentage,
+        'prediction_count': prediction_stats['total'],
+        'avg_confidence': prediction_stats['avg_conf'],
+        'class_dist': prediction_stats['class_distribution'],
     }
 
     return render(request, 'admin_panel/model_detail.html', context)
 
 
-def plot_confusion_matrix(cm, labels, fig_bg_color='#262c49', ax_bg_color='#2c3355', text_color='white'):
-    # Create custom colormap
-    custom_cmap = LinearSegmentedColormap.from_list('dark_theme', ['#2c3355', '#6f5bdc'])
-    fig, ax = plt.subplots(figsize=(6, 5))
-    fig.patch.set_facecolor(fig_bg_color)
-    ax.set_facecolor(ax_bg_color)
+def plot_confusion_matrix(cm, labels, fig_bg_color='#262c49', text_color='white'):
+    """
+    Render a confusion matrix as an inline SVG heatmap.
+
+    Args:
+        cm: Square matrix of counts (list of rows, actual x predicted)
+        labels: Class label for each row/column
+
+    Returns:
+        SVG markup (labels are escaped)
+    """
+    cell, left, top, bottom = 40, 110, 40, 110
+    n = len(cm)
+    width = left + n * cell + 10
+    height = top + n * cell + bottom
+    peak = max((max(row) for row in cm if row), default=0) or 1
+    low, high = CONFUSION_MATRIX_COLORS
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+        f'font-family="sans-serif" font-size="12" fill="{text_color}">',
+        f'<rect width="{width}" height="{height}" fill="{fig_bg_color}"/>',
+        f'<text x="{left + n * cell / 2}" y="{top / 2}" text-anchor="middle" font-size="14">Confusion Matrix</text>',
+    ]
 
-    # Create heatmap
-    heatmap = sns.heatmap(
-        cm, annot=True, fmt='d', cmap=custom_cmap,
-        xticklabels=labels, yticklabels=labels,
-        annot_kws={"color": text_color, "weight": "bold"},
-        ax=ax, cbar=True, linewidths=0.5, linecolor='#1f2233'
+    # Cells, colour interpolated linearly between the two ends of the ramp
+    for i, row in enumerate(cm):
+        for j, value in enumerate(row):
+            t = value / peak
+            r, g, b = (round(lo + (hi - lo) * t) for lo, hi in zip(low, high))
+            x, y = left + j * cell, top + i * cell
+            parts.append(
+                f'<rect x="{x}" y="{y}" width="{cell}" height="{cell}" '
+                f'fill="#{r:02x}{g:02x}{b:02x}" stroke="#1f2233" stroke-width="0.5"/>'
+                f'<text x="{x + cell / 2}" y="{y + cell / 2}" text-anchor="middle" '
+                f'dominant-baseline="central" font-weight="bold">{value}</text>'
+            )
+
+    # Labels and axis titles
+    for k, label in enumerate(labels):
+        label = escape(label)
+        center = k * cell + cell / 2
+        parts.append(
+            f'<text x="{left - 6}" y="{top + center}" text-anchor="end" dominant-baseline="central">{label}</text>'
+            f'<text transform="translate({left + center},{top + n * cell + 6}) rotate(-90)" '
+            f'text-anchor="end" dominant-baseline="central">{label}</text>'
+        )
+    parts.append(f'<text x="{left + n * cell / 2}" y="{height - 8}" text-anchor="middle">Predicted</text>')
+    parts.append(
+        f'<text transform="translate(14,{top + n * cell / 2}) rotate(-90)" text-anchor="middle">Actual</text>'
     )
-    cbar = heatmap.collections[0].colorbar
-    cbar.ax.yaxis.set_tick_params(color=text_color)
-    plt.setp(cbar.ax.get_yticklabels(), color=text_color)
-    if cbar.ax.get_ylabel():
-        cbar.ax.yaxis.label.set_color(text_color)
-
-    # Labels and title
-    ax.set_xlabel('Predicted', color=text_color)
-    ax.set_ylabel('Actual', color=text_color)
-    ax.set_title('Confusion Matrix', color=text_color)
-    ax.tick_params(colors=text_color)
-
-    # Save to buffer
-    buf = io.BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format='png', facecolor=fig_bg_color)
-    plt.close(fig)
-    buf.seek(0)
-
-    img_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-    return img_base64
+    parts.append('</svg>')
+
+    return ''.join(parts)
 
 @login_required
 @user_passes_test(is_staff_or_superuser)
@@ -280,7 +369,8 @@ def view_dataset(request):
             'dataset_versions': [],
         })
 
-    stats = Dataset.get_statistics_for_version(current_dataset.version)
+    # current_dataset is already loaded, so read its stats instead of fetching it again by version
+    stats = current_dataset.get_statistics()
     # {'label_stats': {'like': 1464, 'stop': 1599, 'two_up_inverted': 1525}, 'total_samples': 4588}
 
     total_samples = stats['total_samples']
@@ -291,7 +381,7 @@ def view_dataset(request):
         for label, count in label_counts.items()
     ]
 
-    labels = sorted([item for item in label_counts])
+    labels = sorted(label_counts)
 
     context = {
         'dataset_versions': dataset_versions,
@@ -308,13 +398,18 @@ def view_dataset(request):
 @user_passes_test(is_staff_or_superuser)
 def compare_models(request):
     """Compare active model with a selected candidate model."""
-    active_model = ModelVersion.objects.filter(is_active=True).first()
     candidate_id = request.GET.get('candidate')
     candidate = None
-    models = ModelVersion.objects.all().order_by('-created_at')
+    # The dropdown needs every model anyway, so pick the active model and the candidate out of
+    # that one list instead of fetching each separately. The list holds plain rows of just the
+    # compared fields.
+    models = ModelManager.get_model_summaries()
+    active_model = next((m for m in models if m['is_active']), None)
 
     if candidate_id:
-        candidate = get_object_or_404(ModelVersion, id=candidate_id)
+        candidate = next((m for m in models if str(m['id']) == candidate_id), None)
+        if candidate is None:
+            raise Http404("No ModelVersion matches the given query.")
 
     context = {
         'active_model': active_model,
@@ -332,28 +427,20 @@ def performance_overview(request):
     days = max(1, min(days, 30))
     since = timezone.now() - timedelta(days=days)
 
-    active_model = ModelVersion.objects.filter(is_active=True).first()
+    # The template only shows the active model's version and accuracy
+    active_model = ModelManager.get_active_model_summary()
 
-    preds_qs = Prediction.objects.filter(created_at__gte=since)
-    total_preds = preds_qs.count()
-    avg_conf = preds_qs.aggregate(avg=Avg('confidence'))['avg'] or 0
+    def prediction_stats():
+        return _class_distribution(Prediction.objects.filter(created_at__gte=since))
 
-    class_dist = preds_qs.values('predicted_class').annotate(count=Count('id')).order_by('-count')
-    dist = []
-    for item in class_dist:
-        pct = (item['count'] * 100 / total_preds) if total_preds else 0
-        dist.append({
-            'predicted_class': item['predicted_class'],
-            'count': item['count'],
-            'percentage': round(pct, 1)
-        })
+    stats = cache.get_or_set(f"perf:{days}:{_minute_bucket()}", prediction_stats, STATS_CACHE_TTL)
 
     context = {
         'active_model': active_model,
         'days': days,
-        'total_preds': total_preds,
-        'avg_confidence': avg_conf,
-        'class_distribution': dist,
+        'total_preds': stats['total'],
+        'avg_confidence': stats['avg_conf'],
+        'class_distribution': stats['class_distribution'],
     }
     return render(request, 'admin_panel/performance_overview.html', context)
 
@@ -389,28 +476,40 @@ def start_training(request):
 @user_passes_test(is_staff_or_superuser)
 def training_status(request):
     """List recent training runs with status and allow refresh."""
-    service = TrainingService()
-    runs = TrainingRun.objects.order_by('-created_at')[:20]
+    runs = list(TrainingRun.objects.order_by('-created_at')[:20])
 
     # Optionally refresh statuses for running/pending runs
-    for run in runs:
-        if run.status in ['running', 'pending']:
-            try:
-                service.check_training_status(run)
-            except Exception:
-                pass
+    _sync_training_runs(runs)
+
+    # The page reloads itself while a run is active; answer 304 when no run changed since
+    # the last render. Every change to a run bumps its updated_at. The cancel/delete forms
+    # embed a CSRF token, so a new CSRF cookie or session (e.g. after logging in again)
+    # must not reuse the cached page either.
+    etag = quote_etag(hashlib.md5(repr(
+        [request.user.pk, request.META.get('CSRF_COOKIE'), request.session.session_key]
+        + [(run.pk, run.status, run.updated_at) for run in runs]
+    ).encode()).hexdigest())
+    # Pending flash messages still need a full render to be shown
+    if not len(messages.get_messages(request)):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
 
     context = {
         'runs': runs,
     }
-    return render(request, 'admin_panel/training_status.html', context)
+    response = render(request, 'admin_panel/training_status.html', context)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser)
 def cancel_training(request, run_id):
     """Cancel a specific training run."""
-    run = get_object_or_404(TrainingRun, id=run_id)
+    # The cancel is a status-guarded UPDATE, so skip loading logs/config/metrics
+    run = get_object_or_404(TrainingRun.objects.only('id', 'run_id', 'status'), id=run_id)
     try:
         service = TrainingService()
         service.cancel_training(run)
@@ -441,7 +540,7 @@ def delete_model(request, model_id):
 @require_POST
 def delete_training_run(request, run_id):
     """Delete a training run record."""
-    run = get_object_or_404(TrainingRun, id=run_id)
+    run = get_object_or_404(TrainingRun.objects.only('id', 'run_id', 'status'), id=run_id)
     run_id_str = run.run_id
 
     # Only allow deleting completed, failed, or cancelled runs
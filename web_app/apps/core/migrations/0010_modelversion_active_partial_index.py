@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_modelversion_class_labels'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='modelversion',
+            name='is_active',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='modelversion',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_active'], name='model_versions_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_modelversion_active_partial_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prediction',
+            index=models.Index(fields=['created_at', 'predicted_class', 'confidence'], name='predictions_ct_class_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_prediction_created_class_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainingrun',
+            index=models.Index(fields=['-created_at'], name='training_runs_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_trainingrun_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingrun',
+            name='status_etag',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
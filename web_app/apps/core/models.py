@@ -28,16 +28,19 @@ class Dataset(BaseModel):
 
     def __str__(self):
         return f"{self.version} ({self.validated_preprocessed_samples} samples)"
+
+    def get_statistics(self):
+        """Get statistics for this dataset (stored at upload time, no extra query)."""
+        return {
+            'label_stats': self.label_stats,
+            'total_samples': self.validated_preprocessed_samples,
+        }
     
     @classmethod
     def get_latest_statistics(cls):
         """Get statistics from the most recent dataset."""
         try:
-            dataset = cls.objects.first()
-            return {
-                'label_stats': dataset.label_stats,
-                'total_samples': dataset.validated_preprocessed_samples,
-            }
+            return cls.objects.first().get_statistics()
         except:
             return {
                 'label_stats': [],
@@ -48,11 +51,7 @@ class Dataset(BaseModel):
     def get_statistics_for_version(cls, version):
         """Get statistics for a specific dataset version."""
         try:
-            dataset = cls.objects.get(version=version)
-            return {
-                'label_stats': dataset.label_stats,
-                'total_samples': dataset.validated_preprocessed_samples,
-            }
+            return cls.objects.get(version=version).get_statistics()
         except:
             return {
                 'label_stats': [],
@@ -96,7 +95,7 @@ class ModelVersion(BaseModel):
     confusion_matrix = models.JSONField(null=True, blank=True)
 
     # Deployment status
-    is_active = models.BooleanField(default=False, db_index=True)
+    is_active = models.BooleanField(default=False)
     deployment_date = models.DateTimeField(null=True, blank=True)
     deployed_by = models.ForeignKey(
         User,
@@ -113,6 +112,10 @@ class ModelVersion(BaseModel):
     class Meta:
         db_table = 'model_versions'
         ordering = ['-created_at']
+        indexes = [
+            # At most one row is active: index just that row instead of every version
+            models.Index(fields=['is_active'], condition=models.Q(is_active=True), name='model_versions_active_idx'),
+        ]
 
     def __str__(self):
         status = "ACTIVE" if self.is_active else "INACTIVE"
@@ -149,6 +152,9 @@ class Prediction(BaseModel):
         indexes = [
             models.Index(fields=['request_id', 'created_at']),
             models.Index(fields=['model_version', 'created_at']),
+            # Covers the dashboard/performance aggregates: created_at range, grouped by class,
+            # averaging confidence, all answered from the index without touching the table
+            models.Index(fields=['created_at', 'predicted_class', 'confidence'], name='predictions_ct_class_idx'),
         ]
 
     def __str__(self):
@@ -193,9 +199,17 @@ class TrainingRun(BaseModel):
     error_message = models.TextField(blank=True)
     logs = models.TextField(blank=True)
 
+    # ETag of the last job status read from the ML Training API (sent back as If-None-Match)
+    status_etag = models.CharField(max_length=100, null=True, blank=True)
+
     class Meta:
         db_table = 'training_runs'
         ordering = ['-created_at']
+        indexes = [
+            # training_status lists the latest runs: read them in index order instead of
+            # sorting the whole table (rows carry the logs text)
+            models.Index(fields=['-created_at'], name='training_runs_created_idx'),
+        ]
 
     def __str__(self):
         return f"Training Run {self.run_id} - {self.status}"
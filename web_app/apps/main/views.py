@@ -40,14 +40,14 @@ def log_prediction(result, request_id, landmarks, handedness):
         inference_time_ms = result['timestamp']
         direction = result['direction']
         
-        # Query to get the current active version
-        active_version = ModelVersion.objects.filter(is_active=True).first()
+        # Query to get the current active version (only its id is needed for the FK)
+        active_version_id = ModelVersion.objects.filter(is_active=True).values_list('id', flat=True).first()
 
 
         return Prediction.objects.create(
             request_id=request_id,
             predicted_class=predicted_class,
-            model_version=active_version,
+            model_version_id=active_version_id,
             confidence=confidence,
             landmarks=landmarks,
             handedness=handedness,
@@ -71,6 +71,8 @@ DATABASES = {
     'landmarks': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.environ.get('LANDMARKS_DB_PATH', '/data/landmarks.sqlite'),
+        # Keep the connection across requests; the ML services write this file, Django only reads it
+        'CONN_MAX_AGE': 60,
     }
 }
 
@@ -82,6 +84,10 @@ USE_TZ = True
 STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.environ.get('MEDIA_ROOT', BASE_DIR / 'media')
+# Spool large uploads on the same volume as MEDIA_ROOT so they can be hard-linked into place
+FILE_UPLOAD_TEMP_DIR = os.environ.get('FILE_UPLOAD_TEMP_DIR', os.path.join(MEDIA_ROOT, '.upload_tmp'))
+# The only upload is the dataset ZIP: always spool it to disk (never hold it in RAM)
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
 
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'